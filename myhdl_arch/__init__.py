@@ -1,11 +1,42 @@
 """MyHDL architectural toolkit.
+
+Subpackages and their public names are imported on first access.
 """
 __author__ = 'Uri Nix'
 __version__ = '1.0.0rc'
 
-from clocks import *
-from fifos import *
-from misc import *
+import sys
+from importlib import import_module
+
+# public names per subpackage or module
+_exports = {
+    'clocks': ('ClockGen', 'ClockDivide'),
+    'fifos': ('DCFifo', 'SCFifo', 'MPFifo'),
+    'meters': ('LinkMeter',),
+    'misc': ('cycles', 'clean_vcd', 'quit_simulation'),
+    'fastforward': ('FastForward', 'hyperperiod'),
+}
+_origins = dict((name, module)
+                for module, names in _exports.items() for name in names)
 
 __all__ = []
 
+
+def __getattr__(name):
+    if name in _exports:
+        return import_module('.' + name, __name__)
+    if name in _origins:
+        value = getattr(import_module('.' + _origins[name], __name__), name)
+        globals()[name] = value
+        return value
+    raise AttributeError("module %r has no attribute %r" % (__name__, name))
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_exports) | set(_origins))
+
+
+if sys.version_info < (3, 7):
+    # no module __getattr__ (PEP 562): import eagerly
+    for _name in _origins:
+        __getattr__(_name)
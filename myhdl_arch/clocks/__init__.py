@@ -2,5 +2,5 @@
 '''
 __author__  = 'Uri Nix'
 
-from _clockgen import *
+from ._clockgen import *
 
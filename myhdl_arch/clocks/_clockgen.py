@@ -13,7 +13,7 @@ from myhdl import always, instance, delay, now
 
 
 class ClockGen(object):
-    def __init__(self, ticks=1):
+    def __init__(self, ticks=1, wake=None):
         """
         Clock Generator.
 
@@ -21,6 +21,14 @@ class ClockGen(object):
         -----------
         ticks: int
             simulation delay per clock edge.
+        wake: callable
+            condition for gated clock to run, e.g. domain has work.
+            None to depend on enable port only.
+
+        Attributes:
+        -----------
+        skipped: int
+            number of clock cycles suppressed while gated.
 
         Returns:
         --------
@@ -28,25 +36,56 @@ class ClockGen(object):
         """
         assert isinstance(ticks, int)
         self.ticks = ticks
+        self.wake = wake
+        self.skipped = 0
 
-    def generate(self, o_clk):
+    def generate(self, o_clk, i_enable=None, i_wake=()):
         """
         Generate instance.
 
+        When gated by i_enable or wake, the clock stops low and schedules
+        no edges until re-enabled; it then resumes aligned to the edges of
+        the free running clock.
+
         Ports:
         ------
         o_clk: bool
             logic clock
+        i_enable: Signal(bool)
+            clock enable, None for no enable
+        i_wake: sequence of Signal
+            signals on which wake condition is re-evaluated while gated
         """
-        @always(delay(self.ticks))
-        def logic():
-            o_clk.next = not o_clk
+        if i_enable is None and self.wake is None:
+            @always(delay(self.ticks))
+            def logic():
+                o_clk.next = not o_clk
 
-        return logic
+            return logic
+
+        enabled, sensitivity = _gate(self.wake, i_enable, i_wake)
+        period = 2 * self.ticks
+
+        @instance
+        def gated_logic():
+            while True:
+                yield delay(self.ticks)
+                while not o_clk.val and not enabled():
+                    start = now()
+                    while not enabled():
+                        yield sensitivity
+                    elapsed = now() - start
+                    align = -elapsed % period
+                    self.skipped += (elapsed + align) // period
+                    if align:
+                        yield delay(align)
+                o_clk.next = not o_clk
+
+        return gated_logic
 
 
 class ClockDivide(object):
-    def __init__(self, high=1, low=1):
+    def __init__(self, high=1, low=1, wake=None):
         """
         Divide clock by programming high and low cycle lengths.
         Uses counter updated per i_clk.posedge.
@@ -55,11 +94,14 @@ class ClockDivide(object):
         -----------
         high, low: int
             number of i_clk cycles in o_clk high and low phases.
+        wake: callable
+            condition for gated clock to run, e.g. domain has work.
+            None to depend on enable port only.
 
-        Parameters:
+        Attributes:
         -----------
-        high, low: int
-            number of i_clk cycles in o_clk high and low phases.
+        skipped: int
+            number of i_clk cycles not processed while gated.
 
         Returns:
         --------
@@ -69,24 +111,108 @@ class ClockDivide(object):
         assert isinstance(low, int)
         self.high = high
         self.low = low
+        self.wake = wake
         self.cycle_counter = 0
+        self.skipped = 0
 
-    def generate(self, i_clk, o_clk):
+    def _tick(self, level):
+        """
+        Count one i_clk cycle and return next o_clk level.
+        """
+        self.cycle_counter += 1
+        if self.cycle_counter >= (self.high if level else self.low):
+            self.cycle_counter = 0
+            return not level
+        return level
+
+    def _skip(self, cycles):
+        """
+        Advance phase of o_clk held low by i_clk cycles.
+
+        A phase within the high part of the period is kept as a negative
+        counter, so the next rising edge occurs when it would have had the
+        clock not been gated.
+        """
+        period = self.high + self.low
+        counter = (self.cycle_counter + cycles) % period
+        if counter >= self.low:
+            counter -= period
+        self.cycle_counter = counter
+        self.skipped += cycles
+
+    def generate(self, i_clk, o_clk, i_enable=None, i_wake=()):
         """
         Generate instance.
 
+        When gated by i_enable or wake, o_clk stops low and i_clk is not
+        followed until re-enabled; the phase is then advanced by the i_clk
+        cycles skipped, measured by the shortest i_clk period seen. Until
+        two i_clk edges have measured the period, a gated o_clk skips
+        i_clk edges one by one.
+
         Ports:
         ------
         i_clk: bool
             input clock
         o_clk: bool
             divided output clock
+        i_enable: Signal(bool)
+            clock enable, None for no enable
+        i_wake: sequence of Signal
+            signals on which wake condition is re-evaluated while gated
         """
-        @always(i_clk.posedge)
-        def logic():
-            self.cycle_counter += 1
-            if self.cycle_counter >= (self.high if o_clk.val else self.low):
-                o_clk.next = not o_clk
-                self.cycle_counter = 0
-
-        return logic
+        if i_enable is None and self.wake is None:
+            @always(i_clk.posedge)
+            def logic():
+                level = self._tick(o_clk.val)
+                if level != o_clk.val:
+                    o_clk.next = level
+
+            return logic
+
+        enabled, sensitivity = _gate(self.wake, i_enable, i_wake)
+
+        @instance
+        def gated_logic():
+            period = last_edge = None
+            gated = False
+            while True:
+                yield i_clk.posedge
+                edge = now()
+                if gated:
+                    self._skip((edge - last_edge) // period)
+                    gated = False
+                elif last_edge is not None:
+                    if period is None or edge - last_edge < period:
+                        period = edge - last_edge
+                last_edge = edge
+                if not o_clk.val and not enabled():
+                    if period is None:
+                        # skip edge, next one measures the period
+                        self._skip(1)
+                        continue
+                    while not enabled():
+                        yield sensitivity
+                    gated = True
+                    continue
+                level = self._tick(bool(o_clk.val))
+                if level != o_clk.val:
+                    o_clk.next = level
+
+        return gated_logic
+
+
+def _gate(wake, i_enable, i_wake):
+    """
+    Return enable condition and signals to wait on while gated.
+    """
+    sensitivity = tuple(i_wake)
+    if i_enable is not None:
+        sensitivity = (i_enable,) + sensitivity
+    assert sensitivity, "gated clock requires i_enable or i_wake signals"
+
+    def enabled():
+        return ((i_enable is None or bool(i_enable.val)) and
+                (wake is None or wake()))
+
+    return enabled, sensitivity
@@ -0,0 +1,204 @@
+"""Steady-state fast-forward for periodic myhdl simulations.
+"""
+__author__ = 'Uri Nix'
+
+__all__ = ['FastForward', 'hyperperiod']
+
+### Module Globals ###########################################################
+
+### MyHDL
+from myhdl import now, intbv
+from myhdl import _simulator
+
+### Building Block Units #####################################################
+
+
+def _gcd(a, b):
+    while b:
+        a, b = b, a % b
+    return a
+
+
+def hyperperiod(*periods):
+    """
+    Return least common multiple of several periods.
+
+    Parameters:
+    -----------
+    periods: int
+        periods in simulation ticks, e.g. of divided clocks and test plans.
+
+    Returns:
+    --------
+    int
+    """
+    result = 1
+    for p in periods:
+        assert isinstance(p, int) and p > 0
+        result = result * p // _gcd(result, p)
+    return result
+
+
+def _pending(after):
+    """
+    Return times of pending events later than after.
+    """
+    return set(t for t, event in _simulator._futureEvents if t > after)
+
+
+def _hashable(value):
+    """
+    Return value in a form usable as part of a sampled state.
+    """
+    if isinstance(value, intbv):
+        return int(value)
+    if isinstance(value, list):
+        return tuple(_hashable(v) for v in value)
+    return value
+
+
+def _advance(ticks, limit):
+    """
+    Move simulation time and pending events up to limit forward by ticks.
+    """
+    _simulator._futureEvents[:] = [(t + ticks if t <= limit else t, event)
+            for t, event in _simulator._futureEvents]
+    _simulator._time += ticks
+
+
+class FastForward(object):
+    def __init__(self, period, max_jump=None):
+        """
+        Fast-forward a simulation through periodic steady state.
+
+        The simulation is run in chunks of period ticks. At each chunk
+        boundary the watched state is sampled; once a state recurs, the
+        simulation is a loop, so time is advanced by whole loops and the
+        watched counters are extrapolated by their per-loop increment.
+        The remainder is simulated cycle-accurately.
+
+        Pending events more than one period ahead, e.g. a stimulus change
+        or stop delay, are not part of the loop: they stay at their time,
+        jumps end before them, and the pattern is re-learnt once they have
+        been simulated.
+
+        Only watched attributes are extrapolated: histories (e.g. traces)
+        and payload values already in flight are left as they are.
+
+        Parameters:
+        -----------
+        period: int
+            chunk length in ticks, ideally the hyperperiod of all clocks
+            and stimulus plans.
+        max_jump: int
+            maximum number of loops skipped at once, after which the
+            pattern is re-learnt. None for unlimited.
+
+        Returns:
+        --------
+        None
+        """
+        assert isinstance(period, int) and period > 0
+        assert max_jump is None or (isinstance(max_jump, int) and max_jump > 0)
+        self.period = period
+        self.max_jump = max_jump
+        self.states = []
+        self.counters = []
+        self.skipped = 0
+
+    def watch(self, obj, *attrs):
+        """
+        Add attributes of obj to the state sampled at chunk boundaries.
+        intbv values are sampled as int, lists as tuples.
+        """
+        for a in attrs:
+            self.states.append(lambda obj=obj, a=a: _hashable(getattr(obj, a)))
+
+    def watch_signals(self, *signals):
+        """
+        Add signal values to the state sampled at chunk boundaries.
+        intbv values are sampled as int.
+        """
+        for s in signals:
+            self.states.append(lambda s=s: _hashable(s.val))
+
+    def count(self, obj, *attrs):
+        """
+        Add numeric attributes of obj to be extrapolated on a jump.
+        """
+        for a in attrs:
+            self.counters.append((obj, a))
+
+    def watch_fifo(self, fifo):
+        """
+        Watch occupancy and extrapolate item counts of a FIFO.
+        """
+        self.states.append(fifo.queue.qsize)
+        self.count(fifo, 'wr_count', 'rd_count')
+
+    def watch_clock(self, clkdiv, o_clk):
+        """
+        Watch phase of a ClockDivide instance and its output clock.
+        """
+        self.watch(clkdiv, 'cycle_counter')
+        self.watch_signals(o_clk)
+
+    def _sample(self):
+        return tuple(f() for f in self.states)
+
+    def _counts(self):
+        return [getattr(obj, a) for obj, a in self.counters]
+
+    def _jump(self, loops, span, deltas):
+        for (obj, a), d in zip(self.counters, deltas):
+            setattr(obj, a, getattr(obj, a) + loops * d)
+        _advance(loops * span, now() + self.period)
+        self.skipped += loops * span
+
+    def run(self, sim, duration):
+        """
+        Run simulation for duration ticks, skipping steady-state loops.
+
+        Parameters:
+        -----------
+        sim: myhdl.Simulation
+            simulation to advance.
+        duration: int
+            simulation ticks.
+
+        Returns:
+        --------
+        int
+            as myhdl.Simulation.run: 0 if the simulation finished.
+        """
+        end = now() + duration
+        seen = {}
+        barriers = set()
+        while now() < end:
+            step = min(self.period, end - now())
+            if not sim.run(step, quiet=1):
+                return 0
+            if step < self.period:
+                break
+            crossed = [t for t in barriers if t <= now()]
+            if crossed:
+                barriers.difference_update(crossed)
+                seen.clear()
+            barriers.update(_pending(now() + self.period))
+            state = self._sample()
+            counts = self._counts()
+            if state in seen:
+                t0, counts0 = seen[state]
+                span = now() - t0
+                loops = (end - now()) // span
+                if barriers:
+                    loops = min(loops, (min(barriers) - now() - 1) // span)
+                if self.max_jump is not None:
+                    loops = min(loops, self.max_jump)
+                if loops > 0:
+                    deltas = [c - c0 for c, c0 in zip(counts, counts0)]
+                    self._jump(loops, span, deltas)
+                    seen.clear()
+                    counts = self._counts()
+            seen[state] = (now(), counts)
+        return 1
@@ -2,6 +2,6 @@
 '''
 __author__  = 'Uri Nix'
 
-from _fifos import *
+from ._fifos import *
 
 
@@ -2,11 +2,14 @@
 """
 __author__ = 'Uri Nix'
 
-__all__ = ['DCFifo', 'SCFifo']
+__all__ = ['DCFifo', 'SCFifo', 'MPFifo']
 
 ### Module Globals ###########################################################
 
-from Queue import Queue
+try:
+    from queue import Queue
+except ImportError:
+    from Queue import Queue
 from myhdl import always, instances
 
 ### Building Block Units #####################################################
@@ -22,12 +25,19 @@ class DCFifo(object):
         depth: int
             maximum size of FIFO.
 
+        Attributes:
+        -----------
+        wr_count, rd_count: int
+            number of items written to and read from the FIFO.
+
         Returns:
         --------
         None
         """
         self.depth_m1 = depth - 1
         self.queue = Queue(maxsize=depth)
+        self.wr_count = 0
+        self.rd_count = 0
 
     def generate(self,
             i_wrclk, o_wrrdy, i_wrvalid, i_wrdata,
@@ -55,12 +65,14 @@ class DCFifo(object):
             o_wrrdy.next = (self.queue.qsize() < self.depth_m1)
             if i_wrvalid and o_wrrdy:
                 self.queue.put_nowait(i_wrdata.val)
+                self.wr_count += 1
                 o_fullness.next = self.queue.qsize()
 
         @always(i_rdclk.posedge)
         def rd_access():
             if i_rdrdy and (not self.queue.empty()):
                 o_rddata.next = self.queue.get_nowait()
+                self.rd_count += 1
                 o_fullness.next = self.queue.qsize()
                 o_rdvalid.next = True
             else:
@@ -79,12 +91,19 @@ class SCFifo(object):
         depth: int
             maximum size of FIFO.
 
+        Attributes:
+        -----------
+        wr_count, rd_count: int
+            number of items written to and read from the FIFO.
+
         Returns:
         --------
         None
         """
         self.depth_m1 = depth - 1
         self.queue = Queue(maxsize=depth)
+        self.wr_count = 0
+        self.rd_count = 0
 
     def generate(self, i_clk,
             o_wrrdy, i_wrvalid, i_wrdata,
@@ -112,12 +131,14 @@ class SCFifo(object):
             o_wrrdy.next = (self.queue.qsize() < self.depth_m1)
             if i_wrvalid and o_wrrdy:
                 self.queue.put_nowait(i_wrdata.val)
+                self.wr_count += 1
                 o_fullness.next = self.queue.qsize()
 
         @always(i_clk.posedge)
         def rd_access():
             if i_rdrdy and (not self.queue.empty()):
                 o_rddata.next = self.queue.get_nowait()
+                self.rd_count += 1
                 o_fullness.next = self.queue.qsize()
                 o_rdvalid.next = True
             else:
@@ -125,3 +146,224 @@ class SCFifo(object):
 
         return instances()
 
+
+class _Arbiter(object):
+    def __init__(self, ports, policy='round_robin', weights=None):
+        """
+        Arbiter over request bitmasks, bit i set for requesting port i.
+
+        Parameters:
+        -----------
+        ports: int
+            number of requesters.
+        policy: string
+            'priority' (lowest port wins), 'round_robin' or 'weighted'
+            (round robin, port i keeps grant for up to weights[i] cycles).
+        weights: sequence of int
+            grants per turn for 'weighted' policy.
+
+        Returns:
+        --------
+        None
+        """
+        assert isinstance(ports, int) and ports > 0
+        assert policy in ('priority', 'round_robin', 'weighted')
+        if weights is None:
+            weights = [1] * ports
+        assert len(weights) == ports and min(weights) > 0
+        self.weights = list(weights)
+        self.above = [~((2 << i) - 1) for i in range(ports)]
+        # last granted port, also where an idle port is parked
+        self.last = 0 if policy == 'priority' else ports - 1
+        self.credit = 0
+        self.grant = getattr(self, '_' + policy)
+
+    def _priority(self, mask):
+        return (mask & -mask).bit_length() - 1
+
+    def _round_robin(self, mask):
+        if not mask:
+            return -1
+        above = mask & self.above[self.last]
+        if above:
+            mask = above
+        self.last = (mask & -mask).bit_length() - 1
+        return self.last
+
+    def _weighted(self, mask):
+        if self.credit and (mask >> self.last) & 1:
+            self.credit -= 1
+            return self.last
+        port = self._round_robin(mask)
+        if port >= 0:
+            self.credit = self.weights[port] - 1
+        return port
+
+
+class MPFifo(object):
+    def __init__(self, depth, wr_ports=1, rd_ports=1,
+            wr_policy='round_robin', rd_policy='round_robin',
+            wr_weights=None, rd_weights=None):
+        """
+        Multi-port FIFO using rdy/valid, arbitrated per clock.
+
+        One write and one read are granted per cycle. Arbitration is
+        performed by the access process of each clock on request bitmasks,
+        so the number of processes does not depend on the number of ports.
+
+        While there is space, write rdy is kept on the last granted port,
+        so a single writer sees the same rdy as with SCFifo. Another
+        requesting port is granted rdy on the cycle after it raised valid.
+
+        Parameters:
+        -----------
+        depth: int
+            maximum size of FIFO.
+        wr_ports, rd_ports: int
+            number of write and read ports.
+        wr_policy, rd_policy: string
+            'priority', 'round_robin' or 'weighted'.
+        wr_weights, rd_weights: sequence of int
+            grants per turn for 'weighted' policy.
+
+        Attributes:
+        -----------
+        wr_count, rd_count: int
+            number of items written to and read from the FIFO.
+
+        Returns:
+        --------
+        None
+        """
+        self.depth_m1 = depth - 1
+        self.queue = Queue(maxsize=depth)
+        self.wr_count = 0
+        self.rd_count = 0
+        self.wr_arbiter = _Arbiter(wr_ports, wr_policy, wr_weights)
+        self.rd_arbiter = _Arbiter(rd_ports, rd_policy, rd_weights)
+        self.wr_bits = [1 << i for i in range(wr_ports)]
+        self.rd_bits = [1 << i for i in range(rd_ports)]
+        self.wr_port = -1  # port with rdy/valid asserted, -1 for none
+        self.rd_port = -1
+        self.wr_park = self.wr_arbiter.last  # last granted write port
+
+    def generate(self,
+            i_wrclk, o_wrrdy, i_wrvalid, i_wrdata,
+            i_rdclk, i_rdrdy, o_rdvalid, o_rddata,
+            o_fullness):
+        """
+        Generate instance.
+        Pass the same clock as i_wrclk and i_rdclk for a single clock FIFO,
+        served by a single process.
+
+        rdy/valid ports are either a sequence of Signal(bool), one per port,
+        or a Signal(intbv) with bit i for port i. Packed vectors are read
+        as a request bitmask in one step; sequences are scanned per cycle.
+
+        Ports:
+        ------
+        i_*clk: Signal(bool)
+            access clock
+        o_wrrdy: rdy/valid port
+            FIFO ready to accept data from source on next cycle,
+            asserted for one write port at most
+        i_rdrdy: rdy/valid port
+            Sink ready to accept data from FIFO on next cycle
+        i_wrdata, o_rddata: sequence of Signal(any)
+        i_wrvalid, o_rdvalid: rdy/valid port
+            signify that applicable data lines can be sampled
+        o_fullness: Signal(int)
+            number of elements in FIFO
+        """
+        assert len(o_wrrdy) == len(i_wrvalid) == len(i_wrdata) == len(self.wr_bits)
+        assert len(i_rdrdy) == len(o_rdvalid) == len(o_rddata) == len(self.rd_bits)
+        wr_requests = _requests(i_wrvalid, self.wr_bits)
+        rd_requests = _requests(i_rdrdy, self.rd_bits)
+        wr_select = _selector(o_wrrdy)
+        rd_select = _selector(o_rdvalid)
+        wr_grant = self.wr_arbiter.grant
+        rd_grant = self.rd_arbiter.grant
+
+        def wr_cycle():
+            last = self.wr_port
+            mask = wr_requests()
+            space = (self.queue.qsize() < self.depth_m1)
+            if last >= 0 and (mask >> last) & 1:
+                self.queue.put_nowait(i_wrdata[last].val)
+                self.wr_count += 1
+                o_fullness.next = self.queue.qsize()
+            port = -1
+            if space:
+                port = wr_grant(mask)
+                if port < 0:
+                    port = self.wr_park
+                self.wr_park = port
+            if port != last:
+                wr_select(last, port)
+            self.wr_port = port
+
+        def rd_cycle():
+            last = self.rd_port
+            port = -1
+            if not self.queue.empty():
+                port = rd_grant(rd_requests())
+            if port != last:
+                rd_select(last, port)
+            if port >= 0:
+                o_rddata[port].next = self.queue.get_nowait()
+                self.rd_count += 1
+                o_fullness.next = self.queue.qsize()
+            self.rd_port = port
+
+        if i_wrclk is i_rdclk:
+            @always(i_wrclk.posedge)
+            def access():
+                wr_cycle()
+                rd_cycle()
+
+            return access
+
+        @always(i_wrclk.posedge)
+        def wr_access():
+            wr_cycle()
+
+        @always(i_rdclk.posedge)
+        def rd_access():
+            rd_cycle()
+
+        return instances()
+
+
+def _requests(signals, bits):
+    """
+    Return function reading request bitmask of rdy/valid port.
+    """
+    if not isinstance(signals, (list, tuple)):
+        return lambda: int(signals.val)
+    requests = list(zip(bits, signals))
+
+    def mask():
+        m = 0
+        for bit, s in requests:
+            if s.val:
+                m |= bit
+        return m
+
+    return mask
+
+
+def _selector(signals):
+    """
+    Return function moving assertion of rdy/valid port from last to port.
+    """
+    if not isinstance(signals, (list, tuple)):
+        def select(last, port):
+            signals.next = (1 << port) if port >= 0 else 0
+    else:
+        def select(last, port):
+            if last >= 0:
+                signals[last].next = False
+            if port >= 0:
+                signals[port].next = True
+
+    return select
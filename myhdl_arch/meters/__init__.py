@@ -0,0 +1,6 @@
+'''MyHDL architectural toolkit.
+'''
+__author__  = 'Uri Nix'
+
+from ._meters import *
+
@@ -0,0 +1,148 @@
+"""Behavioural link meters for myhdl.
+"""
+__author__ = 'Uri Nix'
+
+__all__ = ['LinkMeter']
+
+### Module Globals ###########################################################
+
+from array import array
+import csv
+import json
+
+### MyHDL
+from myhdl import always, now
+
+IDLE, BUSY, STALLED = range(3)
+
+### Building Block Units #####################################################
+
+
+class LinkMeter(object):
+    fields = ('name', 'time', 'cycles', 'window', 'transfers',
+              'busy', 'stalled', 'idle')
+    IDLE, BUSY, STALLED = IDLE, BUSY, STALLED
+
+    def __init__(self, window=100, interval=None, stream=None, fmt='csv',
+            name='', registered_rdy=False):
+        """
+        Windowed bandwidth and utilisation meter on a rdy/valid link.
+
+        Each i_clk cycle is classified as busy (valid and rdy: a transfer),
+        stalled (valid without rdy) or idle (no valid). Counts over the last
+        window cycles are kept in a preallocated ring buffer; only periodic
+        snapshots are emitted, never the per-cycle history.
+
+        A FIFO read side answers rdy with valid on the next cycle; meter it
+        with registered_rdy, pairing valid with rdy of the previous cycle.
+
+        Parameters:
+        -----------
+        window: int
+            number of cycles in rolling window.
+        interval: int
+            cycles between snapshots written to stream; defaults to window.
+        stream: file
+            open file receiving snapshots, or None to disable streaming.
+        fmt: string
+            'csv' (with header line) or 'json' (one object per line).
+        name: string
+            link name reported in snapshots.
+        registered_rdy: bool
+            delay rdy by one cycle before pairing with valid.
+
+        Attributes:
+        -----------
+        totals: list of int
+            cycles since start per class, indexed by LinkMeter.IDLE,
+            LinkMeter.BUSY and LinkMeter.STALLED.
+
+        Returns:
+        --------
+        None
+        """
+        assert isinstance(window, int) and window > 0
+        assert interval is None or (isinstance(interval, int) and interval > 0)
+        assert fmt in ('csv', 'json')
+        self.window = window
+        self.interval = window if interval is None else interval
+        self.stream = stream
+        self.fmt = fmt
+        self.name = name
+        self.registered_rdy = registered_rdy
+        self.rdy_d1 = False
+        self.ring = array('B', [IDLE] * window)
+        self.counts = [0, 0, 0]
+        self.totals = [0, 0, 0]
+        self.cycles = 0
+        self.position = 0
+        self.writer = None
+        if stream is not None and fmt == 'csv':
+            self.writer = csv.writer(stream)
+            self.writer.writerow(self.fields)
+
+    def snapshot(self):
+        """
+        Return current window counters.
+
+        Returns:
+        --------
+        dict
+            transfers is the number of handshakes in window; busy, stalled
+            and idle are fractions of window cycles.
+        """
+        filled = min(self.cycles, self.window)
+        scale = 1.0 / filled if filled else 0.0
+        return dict(name=self.name, time=now(), cycles=self.cycles,
+                window=filled, transfers=self.counts[BUSY],
+                busy=self.counts[BUSY] * scale,
+                stalled=self.counts[STALLED] * scale,
+                idle=self.counts[IDLE] * scale)
+
+    def _emit(self):
+        """
+        Write current snapshot to stream.
+        """
+        snap = self.snapshot()
+        if self.writer is not None:
+            self.writer.writerow([snap[f] for f in self.fields])
+        else:
+            self.stream.write(json.dumps(snap, sort_keys=True) + '\n')
+
+    def generate(self, i_clk, i_rdy, i_valid):
+        """
+        Generate instance.
+
+        Ports:
+        ------
+        i_clk: Signal(bool)
+            link clock
+        i_rdy: Signal(bool)
+            sink ready, for this cycle or the next if registered_rdy
+        i_valid: Signal(bool)
+            source valid
+        """
+        ring = self.ring
+        counts = self.counts
+        totals = self.totals
+
+        @always(i_clk.posedge)
+        def logic():
+            rdy = self.rdy_d1 if self.registered_rdy else i_rdy.val
+            self.rdy_d1 = bool(i_rdy.val)
+            if i_valid:
+                code = BUSY if rdy else STALLED
+            else:
+                code = IDLE
+            pos = self.position
+            if self.cycles >= self.window:
+                counts[ring[pos]] -= 1
+            ring[pos] = code
+            counts[code] += 1
+            totals[code] += 1
+            self.position = pos + 1 if pos + 1 < self.window else 0
+            self.cycles += 1
+            if self.stream is not None and self.cycles % self.interval == 0:
+                self._emit()
+
+        return logic
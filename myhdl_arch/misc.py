@@ -2,7 +2,7 @@
 """
 __author__ = 'Uri Nix'
 
-__all__ = ['cycles', 'clean_vcd']
+__all__ = ['cycles', 'clean_vcd', 'quit_simulation']
 
 ### Module Globals ###########################################################
 from myhdl import now
@@ -18,7 +18,7 @@ def cycles():
     """
     Return number of cycles passed in simulation.
     """
-    return now()/2
+    return now()//2
 
 
 def clean_vcd(file_name=None):
@@ -44,3 +44,19 @@ def clean_vcd(file_name=None):
     os.rename(vcd_files[-1], vcd_name)
 
 
+def quit_simulation(sim):
+    """
+    Finalize simulation, allowing a new Simulation instance to be created.
+    Required from myhdl 0.10 onwards, no-op for earlier versions.
+
+    Parameters:
+    -----------
+    sim: myhdl.Simulation
+        simulation to finalize
+
+    Returns:
+    --------
+    None
+    """
+    if hasattr(sim, 'quit'):
+        sim.quit()
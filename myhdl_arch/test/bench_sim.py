@@ -0,0 +1,167 @@
+#! /usr/bin/env python
+"""Benchmark myhdl_arch test benches in simulated cycles per second.
+"""
+from __future__ import print_function
+__author__ = 'Uri Nix'
+
+### Globals ##################################################################
+# Module scope imports and variables
+import json
+import platform
+import subprocess
+import time
+import myhdl
+
+import os
+this_dir = os.path.dirname(os.path.realpath(__file__))
+module_dir = os.path.join(this_dir, r"../..")
+import sys
+sys.path.append(module_dir)
+
+import myhdl_arch
+from test_clocks import TestClockDivide
+from test_fifos import TestDClkFifo, make_test_plan
+
+### Classes and Core functions ###############################################
+
+
+def clocks_bench():
+    return TestClockDivide('bench', {'high' : 3, 'low' : 2})
+
+
+def fifos_bench():
+    plan = make_test_plan(8)
+    return TestDClkFifo('bench', {'depth' : 8, 'wr_ratio' : 2, 'rd_ratio' : 1,
+            'source_plan' : plan[0], 'sink_plan' : plan[1]})
+
+
+benches = {'clocks' : clocks_bench, 'fifos' : fifos_bench}
+
+
+def measure(bench, cycles, repeat):
+    """
+    Return best rate of repeated runs, in root clock cycles per second.
+    """
+    best = 0.0
+    for r in range(repeat):
+        test = benches[bench]()
+        sim = myhdl.Simulation(test.prepareDUT())
+        start = time.time()
+        sim.run(2 * cycles, quiet=1)
+        elapsed = time.time() - start
+        myhdl_arch.misc.quit_simulation(sim)
+        best = max(best, cycles / elapsed)
+    return best
+
+
+def interpreter():
+    return '%s %s' % (platform.python_implementation(),
+                      platform.python_version())
+
+
+def run_local(names, cycles, repeat):
+    results = dict((b, measure(b, cycles, repeat)) for b in names)
+    results['interpreter'] = interpreter()
+    return results
+
+
+def run_remote(executable, names, cycles, repeat):
+    """
+    Run benchmark in another interpreter, None if it is unavailable.
+
+    If the benchmark fails, its output is passed on and the results only
+    hold the interpreter and error. Its stderr is not captured, so
+    warnings and tracebacks are shown as they occur.
+    """
+    cmd = [executable, os.path.realpath(__file__), '--json',
+           '--cycles', str(cycles), '--repeat', str(repeat)] + list(names)
+    try:
+        output = subprocess.check_output(cmd)
+    except OSError:
+        return None
+    except subprocess.CalledProcessError as e:
+        sys.stderr.write(e.output.decode())
+        return {'interpreter' : executable,
+                'error' : 'exit status %d' % e.returncode}
+    return json.loads(output.decode().strip().splitlines()[-1])
+
+
+def report(rows, names):
+    print('%-24s' % 'interpreter' + ''.join('%16s' % b for b in names))
+    for label, results in rows:
+        if results is None:
+            print('%-24s' % label + '%16s' % 'unavailable')
+            continue
+        if 'error' in results:
+            print('%-24s' % label + '  failed: %s' % results['error'])
+            continue
+        print('%-24s' % results['interpreter'] +
+              ''.join('%16.0f' % results[b] for b in names))
+
+
+### Command Line Interface ###################################################
+if __name__ == '__main__':
+
+    ### CLI Option Parser ####################################################
+    import argparse
+
+    desc = __doc__ + '''\n
+Measure current interpreter, or compare several.
+    '''
+    epi = '''
+example:
+    ./bench_sim.py -i python2.7 python3 pypy pypy3
+    '''
+
+    # merge several help formatters
+    class MyFormatter(argparse.RawDescriptionHelpFormatter,
+                      argparse.ArgumentDefaultsHelpFormatter):
+        pass
+
+    parser = argparse.ArgumentParser(description=desc, epilog=epi,
+                                     formatter_class=MyFormatter)
+
+    # options
+    parser.add_argument('-c', '--cycles',
+                        default=20000,
+                        type=int,
+                        help='Simulated root clock cycles per run'
+    )
+    parser.add_argument('-r', '--repeat',
+                        default=3,
+                        type=int,
+                        help='Runs per bench, best is reported'
+    )
+    parser.add_argument('-i', '--interpreters',
+                        nargs='+',
+                        default=None,
+                        help='Interpreter executables to compare'
+    )
+    parser.add_argument('--json',
+                        action='store_true',
+                        help='Print results of current interpreter as JSON'
+    )
+
+    # positional arguments
+    parser.add_argument('benches',
+                        nargs='*',
+                        default=sorted(benches),
+                        help='Benches to run, from: %s' % ', '.join(sorted(benches))
+    )
+
+    ### argument validation ##################################################
+    args = parser.parse_args()
+    for b in args.benches:
+        if b not in benches:
+            parser.error('unknown bench %s' % b)
+
+    ### process ##############################################################
+
+    if args.json:
+        print(json.dumps(run_local(args.benches, args.cycles, args.repeat)))
+    elif args.interpreters:
+        report([(i, run_remote(i, args.benches, args.cycles, args.repeat))
+                for i in args.interpreters], args.benches)
+    else:
+        report([(None, run_local(args.benches, args.cycles, args.repeat))],
+               args.benches)
@@ -1,6 +1,7 @@
 #! /usr/bin/env python
 """Test myhdl_arch clocks.py.
 """
+from __future__ import print_function
 __author__ = 'Uri Nix'
 
 ### Globals ##################################################################
@@ -92,9 +93,106 @@ class TestClockDivide(unittest.TestCase):
     def runTest(self):
         sim = myhdl.Simulation(self.dut)
         sim.run(self.ticks)
-        print "\nMonitor: high=%3d low=%3d" % self.monitor.counters()
-        print "Test:    high=%3d low=%3d" % (self.high, self.low)
-        self.assertItemsEqual(self.monitor.counters(), (self.high, self.low))
+        myhdl_arch.misc.quit_simulation(sim)
+        print("\nMonitor: high=%3d low=%3d" % self.monitor.counters())
+        print("Test:    high=%3d low=%3d" % (self.high, self.low))
+        self.assertEqual(sorted(self.monitor.counters()), sorted((self.high, self.low)))
+
+
+class EdgeRecorder(object):
+    """
+    Record rising edge times of a clock.
+    """
+    def __init__(self):
+        self.edges = []
+
+    def generate(self, i_testclk):
+        @myhdl.always(i_testclk.posedge)
+        def record():
+            self.edges.append(myhdl.now())
+
+        return record
+
+
+class EnableDriver(object):
+    """
+    Toggle enable signal at planned times.
+    """
+    def __init__(self, plan=()):
+        self.plan = plan
+
+    def generate(self, o_enable):
+        @myhdl.instance
+        def logic():
+            for t, value in self.plan:
+                yield myhdl.delay(t - myhdl.now())
+                o_enable.next = value
+
+        return logic
+
+
+class TestGatedClock(unittest.TestCase):
+    def __init__(self, test_name="TestGatedClock", test_parameters=None):
+        super(TestGatedClock, self).__init__()
+        self.name = test_name
+        self.ticks = 400
+        self.high = 0
+        self.low = 0
+        self.enable_plan = ((30, False), (102, True), (180, False), (318, True))
+        if test_parameters:
+            self.__dict__.update(test_parameters)
+        self.driver = EnableDriver(self.enable_plan)
+        self.ref = EdgeRecorder()
+        self.dut = EdgeRecorder()
+        self.clkgen = myhdl_arch.clocks.ClockGen()
+        if self.high:
+            self.ref_clk = myhdl_arch.clocks.ClockDivide(self.high, self.low)
+            self.gated_clk = myhdl_arch.clocks.ClockDivide(self.high, self.low)
+        else:
+            self.gated_clk = myhdl_arch.clocks.ClockGen()
+
+    def shortDescription(self):
+        return self.name
+
+    def prepareDUT(self):
+        self.enable = myhdl.Signal(True)
+        root_clk = myhdl.Signal(False)
+        ref_clk = myhdl.Signal(False)
+        gated_clk = myhdl.Signal(False)
+        driver_inst = self.driver.generate(self.enable)
+        clkgen_inst = self.clkgen.generate(root_clk)
+        if self.high:
+            ref_inst = self.ref_clk.generate(root_clk, ref_clk)
+            gated_inst = self.gated_clk.generate(root_clk, gated_clk, self.enable)
+            self.cycle = 2 * (self.high + self.low)
+        else:
+            ref_inst = self.ref.generate(root_clk)
+            gated_inst = self.gated_clk.generate(gated_clk, self.enable)
+            self.cycle = 2
+        ref_rec_inst = self.ref.generate(ref_clk)
+        dut_rec_inst = self.dut.generate(gated_clk)
+        return myhdl.instances()
+
+    def setUp(self):
+        self.dut_inst = self.prepareDUT()
+
+    def disabled(self, t):
+        enable = True
+        for s, value in self.enable_plan:
+            if s <= t:
+                enable = value
+        return not enable
+
+    def runTest(self):
+        sim = myhdl.Simulation(self.dut_inst)
+        sim.run(self.ticks, quiet=1)
+        myhdl_arch.misc.quit_simulation(sim)
+        ref = self.ref.edges
+        edges = self.dut.edges
+        self.assertTrue(set(edges) <= set(ref))
+        self.assertFalse([t for t in edges if self.disabled(t)])
+        self.assertEqual([t for t in ref if not self.disabled(t)], edges)
+        self.assertTrue(self.gated_clk.skipped > 0)
 
 
 ### unittest test discovery protocol for regression ##########################
@@ -106,10 +204,23 @@ test_parms = (
         {"init_clk" : False, "high" : 4, "low" : 4, "ticks" : 97}
         )
 
+gated_parms = (
+        {"high" : 1, "low" : 1},
+        {"high" : 5, "low" : 3},
+        {"high" : 2, "low" : 7},
+        {"high" : 1, "low" : 1,
+         "enable_plan" : ((0, False), (102, True), (180, False), (318, True))},
+        {"high" : 2, "low" : 3,
+         "enable_plan" : ((0, False), (57, True), (180, False), (318, True))}
+        )
+
 def load_tests(loader, tests, pattern):
     suite = unittest.TestSuite()
     for i,p in enumerate(test_parms):
         suite.addTest(TestClockDivide("clocks_test%d" % i, p))
+    suite.addTest(TestGatedClock("gated_clkgen_test"))
+    for i,p in enumerate(gated_parms):
+        suite.addTest(TestGatedClock("gated_clkdiv_test%d" % i, p))
     return suite
 
 
@@ -0,0 +1,237 @@
+#! /usr/bin/env python
+"""Test myhdl_arch fastforward.py.
+"""
+from __future__ import print_function
+__author__ = 'Uri Nix'
+
+### Globals ##################################################################
+# Module scope imports and variables
+import unittest
+import myhdl
+
+import os
+this_dir = os.path.dirname(os.path.realpath(__file__))
+module_dir = os.path.join(this_dir, r"../..")
+import sys
+sys.path.append(module_dir)
+
+import myhdl_arch
+from test_fifos import Source, Sink
+
+### Classes and Core functions ###############################################
+
+
+class PeriodicDClkFifo(object):
+    """
+    Dual clock FIFO fed by periodic source and sink plans.
+    """
+    def __init__(self, depth, wr_ratio, rd_ratio, source_plan, sink_plan,
+            source_change=None):
+        self.source_change = source_change
+        self.clkgen = myhdl_arch.clocks.ClockGen()
+        self.clkdiv_wr = myhdl_arch.clocks.ClockDivide(wr_ratio, wr_ratio)
+        self.clkdiv_rd = myhdl_arch.clocks.ClockDivide(rd_ratio, rd_ratio)
+        self.source = Source(source_plan)
+        self.sink = Sink(sink_plan)
+        self.fifo = myhdl_arch.fifos.DCFifo(depth)
+        self.period = myhdl_arch.hyperperiod(4*wr_ratio*len(source_plan),
+                4*rd_ratio*len(sink_plan))
+
+    def prepareDUT(self):
+        self.root_clk = myhdl.Signal(False)
+        self.wr_clk = myhdl.Signal(False)
+        self.wr_rdy = myhdl.Signal(False)
+        self.wr_valid = myhdl.Signal(False)
+        self.wr_data = myhdl.Signal(0)
+        self.rd_clk = myhdl.Signal(False)
+        self.rd_rdy = myhdl.Signal(False)
+        self.rd_valid = myhdl.Signal(False)
+        self.rd_data = myhdl.Signal(0)
+        self.fullness = myhdl.Signal(0)
+        self.trace_data = myhdl.Signal(0)
+        self.handshake = myhdl.ConcatSignal(self.wr_rdy, self.wr_valid,
+                self.rd_rdy, self.rd_valid)
+
+        clkgen_inst = self.clkgen.generate(self.root_clk)
+        clkgen_wr_inst = self.clkdiv_wr.generate(self.root_clk, self.wr_clk)
+        clkgen_rd_inst = self.clkdiv_rd.generate(self.root_clk, self.rd_clk)
+        source_inst = self.source.generate(self.wr_clk, self.wr_rdy,
+                self.wr_valid, self.wr_data)
+        sink_inst = self.sink.generate(self.rd_clk, self.rd_rdy,
+                self.rd_valid, self.rd_data, self.trace_data)
+        fifo_inst = self.fifo.generate(self.wr_clk, self.wr_rdy, self.wr_valid,
+                self.wr_data, self.rd_clk, self.rd_rdy, self.rd_valid,
+                self.rd_data, self.fullness)
+        if self.source_change:
+            change_inst = self.change_source(*self.source_change)
+        return myhdl.instances()
+
+    def change_source(self, ticks, plan):
+        """
+        Replace source plan once, at given time.
+        """
+        @myhdl.instance
+        def logic():
+            yield myhdl.delay(ticks)
+            self.source.plan = plan
+
+        return logic
+
+    def fastforward(self, max_jump=None, packed=False):
+        ff = myhdl_arch.FastForward(self.period, max_jump)
+        ff.watch_fifo(self.fifo)
+        ff.watch_clock(self.clkdiv_wr, self.wr_clk)
+        ff.watch_clock(self.clkdiv_rd, self.rd_clk)
+        ff.watch(self.source, 'index')
+        ff.watch(self.sink, 'index')
+        if packed:
+            # intbv and list values in sampled state
+            ff.watch(self.source, 'plan')
+            ff.watch_signals(self.root_clk, self.handshake, self.sink.rdy_d1)
+        else:
+            ff.watch_signals(self.root_clk, self.wr_rdy, self.wr_valid,
+                    self.rd_rdy, self.rd_valid, self.sink.rdy_d1)
+        ff.count(self.source, 'stimulus')
+        return ff
+
+    def results(self):
+        return (myhdl.now(), self.fifo.wr_count, self.fifo.rd_count,
+                self.fifo.queue.qsize(), self.source.stimulus,
+                self.source.index, self.sink.index)
+
+
+class TestFastForward(unittest.TestCase):
+    def __init__(self, test_name="TestFastForward", test_parameters=None):
+        super(TestFastForward, self).__init__()
+        self.name = test_name
+        self.depth = 3
+        self.wr_ratio = 1
+        self.rd_ratio = 1
+        self.source_plan = [1]
+        self.sink_plan = [1]
+        self.periods = 100
+        self.max_jump = None
+        self.source_change = None
+        self.packed = False
+        if test_parameters:
+            self.__dict__.update(test_parameters)
+
+    def shortDescription(self):
+        return self.name
+
+    def makeModel(self):
+        return PeriodicDClkFifo(self.depth, self.wr_ratio, self.rd_ratio,
+                self.source_plan, self.sink_plan, self.source_change)
+
+    def runTest(self):
+        reference = self.makeModel()
+        sim = myhdl.Simulation(reference.prepareDUT())
+        ticks = reference.period * self.periods + 7
+        sim.run(ticks, quiet=1)
+        expected = reference.results()
+        myhdl_arch.misc.quit_simulation(sim)
+
+        model = self.makeModel()
+        sim = myhdl.Simulation(model.prepareDUT())
+        ff = model.fastforward(self.max_jump, self.packed)
+        ff.run(sim, ticks)
+        results = model.results()
+        myhdl_arch.misc.quit_simulation(sim)
+        self.assertEqual(results, expected)
+        self.assertTrue(ff.skipped > 0)
+
+
+### unittest test discovery protocol for regression ##########################
+
+test_parms = (
+        {"source_plan" : [1, 1, 0], "sink_plan" : [1, 0]},
+        {"source_plan" : [1, 1, 1, 0], "sink_plan" : [0, 1, 1], "depth" : 5},
+        {"source_plan" : [1], "sink_plan" : [1, 0, 0], "wr_ratio" : 2},
+        {"source_plan" : [1, 0], "sink_plan" : [1], "rd_ratio" : 3},
+        {"source_plan" : [1, 1, 0], "sink_plan" : [1, 0], "max_jump" : 10},
+        {"source_plan" : [1, 1, 0], "sink_plan" : [1, 0],
+         "source_change" : (2000, [0, 0, 0])},
+        {"source_plan" : [1, 1, 0], "sink_plan" : [1, 0], "max_jump" : 10,
+         "source_change" : (2001, [1, 0, 1])},
+        {"source_plan" : [1, 1, 0], "sink_plan" : [1, 0], "packed" : True,
+         "source_change" : (2000, [0, 0, 0])},
+        )
+
+def load_tests(loader, tests, pattern):
+    suite = unittest.TestSuite()
+    for i,p in enumerate(test_parms):
+        suite.addTest(TestFastForward("fastforward_test%d" % i, p))
+    return suite
+
+
+### Command Line Interface ###################################################
+if __name__ == '__main__':
+
+    ### CLI Option Parser ####################################################
+    import argparse
+
+    desc = __doc__ + '''\n
+Command line exploration: compare fast-forwarded run to full simulation.
+    '''
+    epi = '''
+    '''
+
+    # merge several help formatters
+    class MyFormatter(argparse.RawDescriptionHelpFormatter,
+                      argparse.ArgumentDefaultsHelpFormatter):
+        pass
+
+    parser = argparse.ArgumentParser(description=desc, epilog=epi,
+                                     formatter_class=MyFormatter)
+
+    # options
+    parser.add_argument('--depth',
+                        default=3,
+                        type=int,
+                        help='Fifo depth'
+    )
+    parser.add_argument('--wr-ratio',
+                        default=1,
+                        type=int,
+                        help='Write clock division'
+    )
+    parser.add_argument('--rd-ratio',
+                        default=1,
+                        type=int,
+                        help='Read clock division'
+    )
+    parser.add_argument('-p', '--periods',
+                        default=100,
+                        type=int,
+                        help='Simulated hyperperiods'
+    )
+    parser.add_argument('--max-jump',
+                        default=None,
+                        type=int,
+                        help='Maximum loops skipped at once'
+    )
+
+    # positional arguments
+
+    ### argument validation ##################################################
+    args = parser.parse_args()
+
+    ### process ##############################################################
+
+    test_parms = dict(vars(args), source_plan=[1, 1, 0], sink_plan=[1, 0])
+    test = TestFastForward('StandAlone', test_parms)
+
+    ### MyHDL Simulation
+    reference = test.makeModel()
+    sim = myhdl.Simulation(reference.prepareDUT())
+    ticks = reference.period * args.periods + 7
+    sim.run(ticks, quiet=1)
+    print("Simulated:     %s" % (reference.results(),))
+    myhdl_arch.misc.quit_simulation(sim)
+
+    model = test.makeModel()
+    sim = myhdl.Simulation(model.prepareDUT())
+    ff = model.fastforward(args.max_jump)
+    ff.run(sim, ticks)
+    print("Fast-forward:  %s" % (model.results(),))
+    print("Skipped ticks: %d" % ff.skipped)
@@ -129,10 +129,11 @@ class TestSClkFifo(unittest.TestCase):
         sim = myhdl.Simulation(self.dut)
         ticks = int(max(len(self.sink_plan), len(self.source_plan)) * 1.5)
         sim.run(ticks)
-        #print "Source: %s" % self.source.trace
-        #print "Source: %s" % self.source.trace[:len(self.sink.trace)]
-        #print "Sink: %s" % self.sink.trace
-        self.assertItemsEqual(self.source.trace[:len(self.sink.trace)], self.sink.trace)
+        myhdl_arch.misc.quit_simulation(sim)
+        #print("Source: %s" % self.source.trace)
+        #print("Source: %s" % self.source.trace[:len(self.sink.trace)])
+        #print("Sink: %s" % self.sink.trace)
+        self.assertEqual(sorted(self.source.trace[:len(self.sink.trace)]), sorted(self.sink.trace))
 
 
 class TestDClkFifo(unittest.TestCase):
@@ -188,10 +189,249 @@ class TestDClkFifo(unittest.TestCase):
         sim = myhdl.Simulation(self.dut)
         ticks = int(max(len(self.sink_plan), len(self.source_plan)) * 1.5)
         sim.run(ticks)
-        #print "Source: %s" % self.source.trace
-        #print "Source: %s" % self.source.trace[:len(self.sink.trace)]
-        #print "Sink: %s" % self.sink.trace
-        self.assertItemsEqual(self.source.trace[:len(self.sink.trace)], self.sink.trace)
+        myhdl_arch.misc.quit_simulation(sim)
+        #print("Source: %s" % self.source.trace)
+        #print("Source: %s" % self.source.trace[:len(self.sink.trace)])
+        #print("Sink: %s" % self.sink.trace)
+        self.assertEqual(sorted(self.source.trace[:len(self.sink.trace)]), sorted(self.sink.trace))
+
+
+class TestGatedDClkFifo(TestDClkFifo):
+    """
+    Read clock gated while FIFO is empty and no data is presented.
+    """
+    def __init__(self, test_name="TestGatedDClkFifo", test_parameters=None):
+        # default to a plan that empties the FIFO, so gating occurs
+        parms = make_sc_fifo_parms([3])[0]
+        parms.update(test_parameters or {})
+        super(TestGatedDClkFifo, self).__init__(test_name, parms)
+
+    def prepareDUT(self):
+        root_clk = myhdl.Signal(False)
+        wr_clk = myhdl.Signal(False)
+        wr_rdy = myhdl.Signal(False)
+        wr_valid = myhdl.Signal(False)
+        wr_data = myhdl.Signal(0)
+        rd_clk = myhdl.Signal(False)
+        rd_rdy = myhdl.Signal(False)
+        rd_valid = myhdl.Signal(False)
+        rd_data = myhdl.Signal(0)
+        fullness = myhdl.Signal(0)
+        trace_data = myhdl.Signal(0)
+
+        self.clkdiv_rd.wake = lambda: (not self.fifo.queue.empty()) or rd_valid.val
+        clkgen_inst = self.clkgen.generate(root_clk)
+        clkgen_wr_inst = self.clkdiv_wr.generate(root_clk, wr_clk)
+        clkgen_rd_inst = self.clkdiv_rd.generate(root_clk, rd_clk,
+                i_wake=(fullness, rd_valid))
+        source_inst = self.source.generate(wr_clk, wr_rdy, wr_valid, wr_data)
+        sink_inst = self.sink.generate(rd_clk, rd_rdy, rd_valid, rd_data, trace_data)
+        fifo_inst = self.fifo.generate(wr_clk, wr_rdy, wr_valid, wr_data,
+                rd_clk, rd_rdy, rd_valid, rd_data, fullness)
+
+        self.written = []
+        @myhdl.always(wr_clk.posedge)
+        def wr_monitor():
+            if wr_valid and wr_rdy:
+                self.written.append(wr_data.val)
+
+        self.idle_rd_edges = 0
+        @myhdl.always(rd_clk.posedge)
+        def rd_monitor():
+            if self.fifo.wr_count == 0:
+                self.idle_rd_edges += 1
+
+        return myhdl.instances()
+
+    def runTest(self):
+        # whole plan on the slower clock, so gated cycles are resumed
+        sim = myhdl.Simulation(self.dut)
+        ticks = 4 * max(self.wr_ratio, self.rd_ratio) * \
+                max(len(self.sink_plan), len(self.source_plan))
+        sim.run(ticks)
+        myhdl_arch.misc.quit_simulation(sim)
+        # items written are delivered in order, no stale data after wake-up
+        trace = self.sink.trace
+        self.assertTrue(len(trace) > 0)
+        self.assertEqual(len(self.written), self.fifo.wr_count)
+        self.assertEqual(self.written[:len(trace)], trace)
+        self.assertTrue(0 <= self.fifo.rd_count - len(trace) <= 1)
+        # read clock gated from start, FIFO is empty until first write
+        self.assertEqual(self.idle_rd_edges, 0)
+        self.assertTrue(self.clkdiv_rd.skipped > 0)
+
+
+class PortSource(object):
+    """
+    Transaction source for a FIFO port: data is tagged by port number.
+    """
+    def __init__(self, port, plan=(1,)):
+        self.port = port
+        self.plan = plan
+        self.index = 0
+        self.sent = 0
+
+    def generate(self, i_clk, i_rdy, o_valid, o_data):
+        @myhdl.always(i_clk.posedge)
+        def logic():
+            if o_valid and i_rdy:
+                self.sent += 1
+            elif o_valid:
+                return  # hold data until accepted
+            o_valid.next = bool(self.plan[self.index])
+            o_data.next = self.port * 100000 + self.sent
+            self.index += 1
+            if (self.index >= len(self.plan)):
+                self.index = 0
+        return myhdl.instances()
+
+
+class PortSink(object):
+    """
+    Transaction sink for a FIFO port: records data and receive time.
+    """
+    def __init__(self, plan=(1,)):
+        self.plan = plan
+        self.index = 0
+        self.trace = []
+
+    def generate(self, i_clk, o_rdy, i_valid, i_data):
+        @myhdl.always(i_clk.posedge)
+        def logic():
+            if i_valid:
+                self.trace.append((myhdl.now(), i_data.val))
+            o_rdy.next = bool(self.plan[self.index])
+            self.index += 1
+            if (self.index >= len(self.plan)):
+                self.index = 0
+        return myhdl.instances()
+
+
+class TestMPFifo(unittest.TestCase):
+    def __init__(self, test_name="TestMPFifo", test_parameters=None):
+        super(TestMPFifo, self).__init__()
+        self.name = test_name
+        self.depth = 4
+        self.wr_ports = 3
+        self.rd_ports = 2
+        self.wr_policy = 'round_robin'
+        self.rd_policy = 'round_robin'
+        self.wr_weights = None
+        self.source_plans = [[1]] * self.wr_ports
+        self.sink_plans = [[1]] * self.rd_ports
+        self.dual_clock = False
+        self.packed = False
+        self.ticks = 600
+        if test_parameters:
+            self.__dict__.update(test_parameters)
+        self.clkgen = myhdl_arch.clocks.ClockGen()
+        self.clkdiv_rd = myhdl_arch.clocks.ClockDivide(2, 1)
+        self.sources = [PortSource(i, p) for i, p in enumerate(self.source_plans)]
+        self.sinks = [PortSink(p) for p in self.sink_plans]
+        self.fifo = myhdl_arch.fifos.MPFifo(self.depth,
+                len(self.sources), len(self.sinks),
+                self.wr_policy, self.rd_policy, self.wr_weights)
+
+    def shortDescription(self):
+        return self.name
+
+    def prepareDUT(self):
+        root_clk = myhdl.Signal(False)
+        rd_clk = myhdl.Signal(False) if self.dual_clock else root_clk
+        wr_rdy = [myhdl.Signal(False) for s in self.sources]
+        wr_valid = [myhdl.Signal(False) for s in self.sources]
+        wr_data = [myhdl.Signal(0) for s in self.sources]
+        rd_rdy = [myhdl.Signal(False) for s in self.sinks]
+        rd_valid = [myhdl.Signal(False) for s in self.sinks]
+        rd_data = [myhdl.Signal(0) for s in self.sinks]
+        fullness = myhdl.Signal(0)
+        fifo_wr_rdy, fifo_wr_valid = wr_rdy, wr_valid
+        fifo_rd_rdy, fifo_rd_valid = rd_rdy, rd_valid
+        if self.packed:
+            # vectors driven by FIFO, bit views for the ports
+            fifo_wr_rdy = myhdl.Signal(myhdl.intbv(0)[len(self.sources):])
+            fifo_rd_valid = myhdl.Signal(myhdl.intbv(0)[len(self.sinks):])
+            wr_rdy = [fifo_wr_rdy(i) for i in range(len(self.sources))]
+            rd_valid = [fifo_rd_valid(i) for i in range(len(self.sinks))]
+            # vectors gathered from the ports
+            fifo_wr_valid = myhdl.ConcatSignal(*reversed(wr_valid))
+            fifo_rd_rdy = myhdl.ConcatSignal(*reversed(rd_rdy))
+
+        clkgen_inst = self.clkgen.generate(root_clk)
+        if self.dual_clock:
+            clkgen_rd_inst = self.clkdiv_rd.generate(root_clk, rd_clk)
+        source_inst = [s.generate(root_clk, wr_rdy[i], wr_valid[i], wr_data[i])
+                for i, s in enumerate(self.sources)]
+        sink_inst = [s.generate(rd_clk, rd_rdy[i], rd_valid[i], rd_data[i])
+                for i, s in enumerate(self.sinks)]
+        fifo_inst = self.fifo.generate(root_clk,
+                fifo_wr_rdy, fifo_wr_valid, wr_data,
+                rd_clk, fifo_rd_rdy, fifo_rd_valid, rd_data, fullness)
+        return myhdl.instances()
+
+    def setUp(self):
+        self.dut = self.prepareDUT()
+
+    def runTest(self):
+        sim = myhdl.Simulation(self.dut)
+        sim.run(self.ticks, quiet=1)
+        myhdl_arch.misc.quit_simulation(sim)
+        received = sorted(sum([s.trace for s in self.sinks], []))
+        received = [d for t, d in received]
+        # last item read may still be in flight to its sink
+        self.assertTrue(0 <= self.fifo.rd_count - len(received) <= 1)
+        self.assertEqual(self.fifo.wr_count - self.fifo.rd_count,
+                self.fifo.queue.qsize())
+        self.assertEqual(sum(s.sent for s in self.sources), self.fifo.wr_count)
+        # each source is delivered in order, without loss or duplication
+        for s in self.sources:
+            data = [d % 100000 for d in received if d // 100000 == s.port]
+            self.assertEqual(data, list(range(len(data))))
+            self.assertTrue(len(data) > 0 or self.wr_policy == 'priority')
+        sent = [s.sent for s in self.sources]
+        if self.wr_policy == 'priority':
+            self.assertEqual(sent[1:], [0] * (len(sent) - 1))
+        elif self.wr_policy == 'round_robin':
+            self.assertTrue(max(sent) - min(sent) <= 1)
+        else:
+            weights = self.wr_weights
+            for s, w in zip(sent, weights):
+                self.assertAlmostEqual(float(s) / sent[0], float(w) / weights[0],
+                        delta=0.1)
+
+
+class TestMPFifoSource(TestSClkFifo):
+    """
+    Single port MPFifo works with the existing Source and Sink, as SCFifo.
+    """
+    def __init__(self, test_name="TestMPFifoSource", test_parameters=None):
+        # default to a plan long enough for writes to occur
+        parms = make_sc_fifo_parms([3])[0]
+        parms.update(test_parameters or {})
+        super(TestMPFifoSource, self).__init__(test_name, parms)
+        self.fifo = myhdl_arch.fifos.MPFifo(self.depth)
+
+    def prepareDUT(self):
+        root_clk = myhdl.Signal(False)
+        wr_rdy = myhdl.Signal(False)
+        wr_valid = myhdl.Signal(False)
+        wr_data = myhdl.Signal(0)
+        rd_rdy = myhdl.Signal(False)
+        rd_valid = myhdl.Signal(False)
+        rd_data = myhdl.Signal(0)
+        fullness = myhdl.Signal(0)
+        trace_data = myhdl.Signal(0)
+
+        clkgen_inst = self.clkgen.generate(root_clk)
+        source_inst = self.source.generate(root_clk, wr_rdy, wr_valid, wr_data)
+        sink_inst = self.sink.generate(root_clk, rd_rdy, rd_valid, rd_data, trace_data)
+        fifo_inst = self.fifo.generate(root_clk, [wr_rdy], [wr_valid], [wr_data],
+                root_clk, [rd_rdy], [rd_valid], [rd_data], fullness)
+        return myhdl.instances()
+
+    def runTest(self):
+        super(TestMPFifoSource, self).runTest()
+        self.assertTrue(self.fifo.wr_count > 0)
 
 
 ### unittest test discovery protocol for regression ##########################
@@ -231,6 +471,7 @@ def load_tests(loader, tests, pattern):
     for i,p in enumerate(sc_test_parms):
         suite.addTest(TestSClkFifo("scfifo_test%d" % i, p))
         suite.addTest(TestDClkFifo("dcfifo_test%d" % i, p))
+        suite.addTest(TestGatedDClkFifo("gated_dcfifo_test%d" % i, p))
 
     ratios = zip((2,3,4,5,6,7,8), (1,1,1,1,1,1,1))
     for r in ratios:
@@ -238,6 +479,7 @@ def load_tests(loader, tests, pattern):
             t.update(dict({'wr_ratio':r[0], 'rd_ratio':r[1]}))
         for i,p in enumerate(sc_test_parms):
             suite.addTest(TestDClkFifo("dcfifo_test%d-w%d-r%d" % (i, r[0], r[1]), p))
+            suite.addTest(TestGatedDClkFifo("gated_dcfifo_test%d-w%d-r%d" % (i, r[0], r[1]), p))
 
     ratios = zip((1,1,1,1,1,1,1), (2,3,4,5,6,7,8))
     for r in ratios:
@@ -245,6 +487,25 @@ def load_tests(loader, tests, pattern):
             t.update(dict({'wr_ratio':r[0], 'rd_ratio':r[1]}))
         for i,p in enumerate(sc_test_parms):
             suite.addTest(TestDClkFifo("dcfifo_test%d-w%d-r%d" % (i, r[0], r[1]), p))
+            suite.addTest(TestGatedDClkFifo("gated_dcfifo_test%d-w%d-r%d" % (i, r[0], r[1]), p))
+
+    mp_test_parms = (
+            {},
+            {'dual_clock' : True},
+            {'wr_policy' : 'priority', 'rd_policy' : 'priority'},
+            {'wr_policy' : 'weighted', 'wr_weights' : [1, 2, 3],
+             'rd_policy' : 'weighted', 'ticks' : 1200},
+            {'source_plans' : [[1, 0], [1, 1, 0], [0, 1]],
+             'sink_plans' : [[1, 0, 0], [0, 1]], 'rd_policy' : 'priority',
+             'depth' : 3},
+            )
+    for i,p in enumerate(mp_test_parms):
+        suite.addTest(TestMPFifo("mpfifo_test%d" % i, p))
+        p = dict(p, packed=True)
+        suite.addTest(TestMPFifo("mpfifo_packed_test%d" % i, p))
+
+    for i,p in enumerate(make_sc_fifo_parms(range(2, 6))):
+        suite.addTest(TestMPFifoSource("mpfifo_source_test%d" % i, p))
 
     return suite
 
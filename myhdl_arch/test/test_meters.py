@@ -0,0 +1,219 @@
+#! /usr/bin/env python
+"""Test myhdl_arch meters.py.
+"""
+__author__ = 'Uri Nix'
+
+### Globals ##################################################################
+# Module scope imports and variables
+import unittest
+import myhdl
+import json
+try:
+    from StringIO import StringIO
+except ImportError:
+    from io import StringIO
+
+import os
+this_dir = os.path.dirname(os.path.realpath(__file__))
+module_dir = os.path.join(this_dir, r"../..")
+import sys
+sys.path.append(module_dir)
+
+import myhdl_arch
+from test_fifos import Source, Sink
+
+### Classes and Core functions ###############################################
+
+
+class Driver(object):
+    """
+    Drive rdy/valid according to test plans.
+    """
+    def __init__(self, rdy_plan, valid_plan):
+        self.index = 0
+        self.rdy_plan = rdy_plan
+        self.valid_plan = valid_plan
+
+    def generate(self, i_clk, o_rdy, o_valid):
+        @myhdl.always(i_clk.negedge)
+        def logic():
+            o_rdy.next = bool(self.rdy_plan[self.index])
+            o_valid.next = bool(self.valid_plan[self.index])
+            self.index = (self.index + 1) % len(self.rdy_plan)
+        return myhdl.instances()
+
+
+class TestLinkMeter(unittest.TestCase):
+    def __init__(self, test_name="TestLinkMeter", test_parameters=None):
+        super(TestLinkMeter, self).__init__()
+        self.name = test_name
+        self.window = 8
+        self.cycles = 40
+        self.fmt = 'csv'
+        # per 4 cycles: 2 busy, 1 stalled, 1 idle
+        self.rdy_plan = [1, 0, 0, 1]
+        self.valid_plan = [1, 1, 0, 1]
+        if test_parameters:
+            self.__dict__.update(test_parameters)
+        self.stream = StringIO()
+        self.clkgen = myhdl_arch.clocks.ClockGen()
+        self.driver = Driver(self.rdy_plan, self.valid_plan)
+        self.meter = myhdl_arch.meters.LinkMeter(self.window,
+                stream=self.stream, fmt=self.fmt, name='link')
+
+    def shortDescription(self):
+        return self.name
+
+    def prepareDUT(self):
+        clk = myhdl.Signal(False)
+        rdy = myhdl.Signal(False)
+        valid = myhdl.Signal(False)
+        clkgen_inst = self.clkgen.generate(clk)
+        driver_inst = self.driver.generate(clk, rdy, valid)
+        meter_inst = self.meter.generate(clk, rdy, valid)
+        return myhdl.instances()
+
+    def setUp(self):
+        self.dut = self.prepareDUT()
+
+    def runTest(self):
+        sim = myhdl.Simulation(self.dut)
+        sim.run(2 * self.cycles - 1, quiet=1)
+        myhdl_arch.misc.quit_simulation(sim)
+        snap = self.meter.snapshot()
+        self.assertEqual(snap['cycles'], self.cycles)
+        self.assertEqual(snap['window'], self.window)
+        self.assertEqual(snap['transfers'], self.window // 2)
+        self.assertAlmostEqual(snap['busy'], 0.5)
+        self.assertAlmostEqual(snap['stalled'], 0.25)
+        self.assertAlmostEqual(snap['idle'], 0.25)
+        self.assertEqual(sum(self.meter.totals), self.cycles)
+
+        lines = self.stream.getvalue().splitlines()
+        if self.fmt == 'csv':
+            self.assertEqual(lines[0].split(','),
+                    list(myhdl_arch.meters.LinkMeter.fields))
+            lines = lines[1:]
+            self.assertEqual(lines[-1].split(',')[4], '4')
+        else:
+            self.assertEqual(json.loads(lines[-1])['transfers'], 4)
+        self.assertEqual(len(lines), self.cycles // self.window)
+
+
+class TestFifoLinkMeter(unittest.TestCase):
+    def __init__(self, test_name="TestFifoLinkMeter", test_parameters=None):
+        super(TestFifoLinkMeter, self).__init__()
+        self.name = test_name
+        self.depth = 3
+        self.source_plan = [1, 1, 1, 0]
+        self.sink_plan = [1, 0, 0]
+        if test_parameters:
+            self.__dict__.update(test_parameters)
+        self.clkgen = myhdl_arch.clocks.ClockGen()
+        self.source = Source(self.source_plan)
+        self.sink = Sink(self.sink_plan)
+        self.fifo = myhdl_arch.fifos.SCFifo(self.depth)
+        self.wr_meter = myhdl_arch.meters.LinkMeter(16)
+        self.rd_meter = myhdl_arch.meters.LinkMeter(16, registered_rdy=True)
+
+    def shortDescription(self):
+        return self.name
+
+    def prepareDUT(self):
+        root_clk = myhdl.Signal(False)
+        wr_rdy = myhdl.Signal(False)
+        wr_valid = myhdl.Signal(False)
+        wr_data = myhdl.Signal(0)
+        rd_rdy = myhdl.Signal(False)
+        rd_valid = myhdl.Signal(False)
+        rd_data = myhdl.Signal(0)
+        fullness = myhdl.Signal(0)
+        trace_data = myhdl.Signal(0)
+
+        clkgen_inst = self.clkgen.generate(root_clk)
+        source_inst = self.source.generate(root_clk, wr_rdy, wr_valid, wr_data)
+        sink_inst = self.sink.generate(root_clk, rd_rdy, rd_valid, rd_data, trace_data)
+        fifo_inst = self.fifo.generate(root_clk, wr_rdy, wr_valid, wr_data, rd_rdy, rd_valid,
+                rd_data, fullness)
+        wr_meter_inst = self.wr_meter.generate(root_clk, wr_rdy, wr_valid)
+        rd_meter_inst = self.rd_meter.generate(root_clk, rd_rdy, rd_valid)
+        return myhdl.instances()
+
+    def setUp(self):
+        self.dut = self.prepareDUT()
+
+    def runTest(self):
+        sim = myhdl.Simulation(self.dut)
+        sim.run(200, quiet=1)
+        myhdl_arch.misc.quit_simulation(sim)
+        LinkMeter = myhdl_arch.meters.LinkMeter
+        self.assertEqual(self.wr_meter.totals[LinkMeter.BUSY], self.fifo.wr_count)
+        self.assertTrue(self.wr_meter.totals[LinkMeter.STALLED] > 0)
+        # last item read may still be in flight
+        rd_busy = self.rd_meter.totals[LinkMeter.BUSY]
+        self.assertTrue(self.fifo.rd_count > 0)
+        self.assertTrue(0 <= self.fifo.rd_count - rd_busy <= 1)
+        self.assertEqual(self.rd_meter.totals[LinkMeter.STALLED], 0)
+
+
+### unittest test discovery protocol for regression ##########################
+
+def load_tests(loader, tests, pattern):
+    suite = unittest.TestSuite()
+    suite.addTest(TestLinkMeter("meters_test_csv", {'fmt' : 'csv'}))
+    suite.addTest(TestLinkMeter("meters_test_json", {'fmt' : 'json'}))
+    suite.addTest(TestFifoLinkMeter("meters_test_fifo"))
+    return suite
+
+
+### Command Line Interface ###################################################
+if __name__ == '__main__':
+
+    ### CLI Option Parser ####################################################
+    import argparse
+
+    desc = __doc__ + '''\n
+Command line exploration: stream link snapshots to stdout.
+    '''
+    epi = '''
+    '''
+
+    # merge several help formatters
+    class MyFormatter(argparse.RawDescriptionHelpFormatter,
+                      argparse.ArgumentDefaultsHelpFormatter):
+        pass
+
+    parser = argparse.ArgumentParser(description=desc, epilog=epi,
+                                     formatter_class=MyFormatter)
+
+    # options
+    parser.add_argument('-w', '--window',
+                        default=8,
+                        type=int,
+                        help='Meter window in cycles'
+    )
+    parser.add_argument('-c', '--cycles',
+                        default=40,
+                        type=int,
+                        help='Simulated link cycles'
+    )
+    parser.add_argument('--fmt',
+                        default='csv',
+                        choices=('csv', 'json'),
+                        help='Snapshot format'
+    )
+
+    # positional arguments
+
+    ### argument validation ##################################################
+    args = parser.parse_args()
+
+    ### process ##############################################################
+
+    test = TestLinkMeter('StandAlone', vars(args))
+    test.meter = myhdl_arch.meters.LinkMeter(args.window, stream=sys.stdout,
+            fmt=args.fmt, name='link')
+
+    ### MyHDL Simulation
+    sim = myhdl.Simulation(test.prepareDUT())
+    sim.run(2 * args.cycles - 1, quiet=1)
@@ -0,0 +1,93 @@
+#! /usr/bin/env python
+"""Test myhdl_arch package exports.
+"""
+from __future__ import print_function
+__author__ = 'Uri Nix'
+
+### Globals ##################################################################
+# Module scope imports and variables
+import unittest
+from importlib import import_module
+
+import os
+this_dir = os.path.dirname(os.path.realpath(__file__))
+module_dir = os.path.join(this_dir, r"../..")
+import sys
+sys.path.append(module_dir)
+
+import myhdl_arch
+
+### Classes and Core functions ###############################################
+
+implementations = {
+        'clocks' : 'myhdl_arch.clocks._clockgen',
+        'fifos' : 'myhdl_arch.fifos._fifos',
+        'meters' : 'myhdl_arch.meters._meters',
+        'misc' : 'myhdl_arch.misc',
+        'fastforward' : 'myhdl_arch.fastforward',
+        }
+
+
+class TestExports(unittest.TestCase):
+    def runTest(self):
+        self.assertEqual(sorted(myhdl_arch._exports), sorted(implementations))
+        for module, names in myhdl_arch._exports.items():
+            impl = import_module(implementations[module])
+            self.assertEqual(sorted(names), sorted(impl.__all__))
+            self.assertTrue(getattr(myhdl_arch, module) is
+                    import_module('myhdl_arch.' + module))
+            for name in names:
+                self.assertTrue(getattr(myhdl_arch, name) is getattr(impl, name))
+                self.assertTrue(name in dir(myhdl_arch))
+        self.assertRaises(AttributeError, getattr, myhdl_arch, 'NoSuchName')
+
+
+### unittest test discovery protocol for regression ##########################
+
+def load_tests(loader, tests, pattern):
+    suite = unittest.TestSuite()
+    suite.addTest(TestExports())
+    return suite
+
+
+### Command Line Interface ###################################################
+if __name__ == '__main__':
+
+    ### CLI Option Parser ####################################################
+    import argparse
+
+    desc = __doc__ + '''\n
+Command line exploration: list public names and where they are defined.
+    '''
+    epi = '''
+    '''
+
+    # merge several help formatters
+    class MyFormatter(argparse.RawDescriptionHelpFormatter,
+                      argparse.ArgumentDefaultsHelpFormatter):
+        pass
+
+    parser = argparse.ArgumentParser(description=desc, epilog=epi,
+                                     formatter_class=MyFormatter)
+
+    # options
+
+    # positional arguments
+    parser.add_argument('modules',
+                        nargs='*',
+                        default=sorted(implementations),
+                        help='Subpackages to list, from: %s' %
+                                ', '.join(sorted(implementations))
+    )
+
+    ### argument validation ##################################################
+    args = parser.parse_args()
+    for m in args.modules:
+        if m not in implementations:
+            parser.error('unknown subpackage %s' % m)
+
+    ### process ##############################################################
+
+    for m in args.modules:
+        for name in sorted(myhdl_arch._exports[m]):
+            print('%-32s%s' % ('myhdl_arch.' + name, implementations[m]))